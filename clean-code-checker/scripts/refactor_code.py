@@ -4,13 +4,46 @@ Clean Code Refactorer
 Applies Clean Code optimizations to code files
 """
 
+import os
 import re
+import shutil
 import sys
 import argparse
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Set, Optional
+from typing import Any, Dict, List, Set, Optional
 from dataclasses import dataclass
-from datetime import datetime
+from time import time_ns
+
+
+_JS_LANGS = frozenset({'js', 'ts'})
+
+_SNAKE_DEF_RE = re.compile(r'\bdef\s+([a-z][a-zA-Z0-9_]*)')
+_SNAKE_CLASS_RE = re.compile(r'\bclass\s+([A-Z][a-zA-Z0-9_]*)')
+_JS_DECL_RE = re.compile(r'\b(let|const|var)\s+([a-z][a-zA-Z0-9_]*)')
+_JS_FUNC_RE = re.compile(r'\bfunction\s+([a-z][a-zA-Z0-9_]*)')
+_BARE_EXCEPT_RE = re.compile(r'^\s*except:\s*$')
+_TRAILING_WS_RE = re.compile(r'[^\S\n]+$', re.MULTILINE)
+_USELESS_COMMENT_RE = re.compile(r'^\s*//\s*(?:todo|fixme|hack|this function)\b', re.IGNORECASE)
+_CAMEL_RE1 = re.compile(r'(.)([A-Z][a-z]+)')
+_CAMEL_RE2 = re.compile(r'([a-z0-9])([A-Z])')
+# Each run of underscores is dropped and the character after it capitalized
+_SNAKE_RE = re.compile(r'_+([A-Za-z0-9]?)')
+
+# Magic numbers replaced by named constants
+_MAGIC_MAP = {
+    '1000': 'MAX_ITEMS',
+    '100': 'DEFAULT_TIMEOUT',
+    '50': 'MAX_RESULTS',
+    '10': 'DEFAULT_LIMIT',
+    '5': 'RETRY_COUNT'
+}
+# Whole numbers only: not part of a longer number, a name or a decimal like 0.5
+_MAGIC_RE = re.compile(r'(?<![\w.])(1000|100|50|10|5)(?![\w.])')
+_MAGIC_CONST_RE = re.compile(r'\b(?:' + '|'.join(_MAGIC_MAP.values()) + r')\b')
+# Opening quotes of a Python docstring, with any string prefix
+_PY_DOCSTRING_RE = re.compile(r'[rRuUbB]{0,2}("""|\'\'\')')
 
 
 @dataclass
@@ -20,6 +53,8 @@ class RefactoringRule:
     category: str
     description: str
     apply_function: callable
+    # Set for rules that only look at one line at a time
+    line_function: Optional[callable] = None
 
 
 class CleanCodeRefactorer:
@@ -29,6 +64,9 @@ class CleanCodeRefactorer:
         self.language = language.lower()
         self.refactored_lines: List[str] = []
         self.rules_applied: Set[str] = set()
+        # Long-line breaker for this language, chosen once
+        self._break_line = (self._break_js_line if self.language in _JS_LANGS
+                            else self._break_python_line)
 
     def refactor(self, file_path: str, rules: List[str] = None) -> Dict[str, Any]:
         """Refactor a file according to Clean Code principles"""
@@ -36,41 +74,47 @@ class CleanCodeRefactorer:
             with open(file_path, 'r', encoding='utf-8') as file:
                 lines = file.readlines()
 
-            self.refactored_lines = lines.copy()
+            # Rules edit this list in place; the backup is copied from disk
+            original_count = len(lines)
+            self.refactored_lines = lines
             self.rules_applied = set()
 
             # Apply refactoring rules
-            all_rules = self._get_all_rules()
-
             if rules:
                 # Apply only specified rules
                 for rule_name in rules:
-                    if rule_name in all_rules:
-                        all_rules[rule_name].apply_function(self)
+                    if rule_name in _ALL_RULES:
+                        _ALL_RULES[rule_name].apply_function(self)
                         self.rules_applied.add(rule_name)
             else:
-                # Apply all rules
-                for rule in all_rules.values():
+                # Apply all rules; consecutive line-local rules share one pass
+                line_rules: List[RefactoringRule] = []
+                for rule in _ALL_RULES.values():
+                    if rule.line_function:
+                        line_rules.append(rule)
+                        continue
+                    self._apply_line_rules(line_rules)
+                    line_rules = []
                     try:
                         rule.apply_function(self)
                         self.rules_applied.add(rule.name)
                     except Exception as e:
                         print(f"Warning: Rule {rule.name} failed: {e}")
+                self._apply_line_rules(line_rules)
 
             # Save refactored code
             if self.rules_applied:
-                backup_path = f"{file_path}.backup.{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-                with open(backup_path, 'w', encoding='utf-8') as backup_file:
-                    backup_file.writelines(lines)
+                # Nanosecond stamp so back-to-back runs never share a backup name
+                backup_path = f"{file_path}.backup.{time_ns():x}"
+                shutil.copyfile(file_path, backup_path)
 
-                with open(file_path, 'w', encoding='utf-8') as output_file:
-                    output_file.writelines(self.refactored_lines)
+                self._write_result(file_path, ''.join(self.refactored_lines))
 
                 return {
                     'success': True,
                     'rules_applied': list(self.rules_applied),
                     'backup_file': backup_path,
-                    'changes_count': len(self.refactored_lines) - len(lines)
+                    'changes_count': len(self.refactored_lines) - original_count
                 }
             else:
                 return {
@@ -87,128 +131,201 @@ class CleanCodeRefactorer:
                 'rules_applied': list(self.rules_applied)
             }
 
-    def _get_all_rules(self) -> Dict[str, RefactoringRule]:
-        """Get all available refactoring rules"""
-        return {
-            'fix_naming': RefactoringRule(
-                'fix_naming', 'naming',
-                'Fix naming conventions',
-                self._fix_naming_conventions
-            ),
-            'shorten_functions': RefactoringRule(
-                'shorten_functions', 'functions',
-                'Break down long functions',
-                self._shorten_functions
-            ),
-            'remove_trailing_whitespace': RefactoringRule(
-                'remove_trailing_whitespace', 'formatting',
-                'Remove trailing whitespace',
-                self._remove_trailing_whitespace
-            ),
-            'break_long_lines': RefactoringRule(
-                'break_long_lines', 'formatting',
-                'Break long lines',
-                self._break_long_lines
-            ),
-            'extract_constants': RefactoringRule(
-                'extract_constants', 'magic_numbers',
-                'Extract magic numbers to constants',
-                self._extract_constants
-            ),
-            'improve_error_handling': RefactoringRule(
-                'improve_error_handling', 'error_handling',
-                'Improve error handling',
-                self._improve_error_handling
-            ),
-            'remove_useless_comments': RefactoringRule(
-                'remove_useless_comments', 'comments',
-                'Remove useless comments',
-                self._remove_useless_comments
-            )
-        }
+    def _write_result(self, file_path: str, text: str):
+        """Write the refactored text over the file at file_path"""
+        # Write through symlinks to the file they point at
+        target = os.path.realpath(file_path)
+        if os.stat(target).st_nlink > 1:
+            # Swapping in a new file would detach the other hard links
+            with open(target, 'w', encoding='utf-8') as output_file:
+                output_file.write(text)
+            return
+
+        # Write to a temporary file next to the target, then swap it in so
+        # the file is never half-written
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(target))
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as output_file:
+                output_file.write(text)
+            shutil.copymode(target, tmp_path)
+            os.replace(tmp_path, target)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def _apply_line_rules(self, line_rules: List[RefactoringRule]):
+        """Apply line-local rules in order with a single walk over the file"""
+        if not line_rules:
+            return
+        lines = self.refactored_lines
+        for i, line in enumerate(lines):
+            for rule in line_rules:
+                try:
+                    line = rule.line_function(self, line)
+                except Exception as e:
+                    print(f"Warning: Rule {rule.name} failed: {e}")
+                    line_rules = [r for r in line_rules if r is not rule]
+            lines[i] = line
+        self.rules_applied.update(rule.name for rule in line_rules)
+
+    def _map_lines(self, line_function: callable):
+        """Replace every line with the result of line_function"""
+        lines = self.refactored_lines
+        for i, line in enumerate(lines):
+            lines[i] = line_function(line)
 
     def _fix_naming_conventions(self):
         """Fix naming convention violations"""
+        self._map_lines(self._fix_naming_line)
 
-        if self.language in ['js', 'ts']:
+    def _fix_naming_line(self, line: str) -> str:
+        """Fix naming convention violations on one line"""
+        if self.language in _JS_LANGS:
             # Convert snake_case to camelCase
-            for i, line in enumerate(self.refactored_lines):
-                # Fix variable declarations
-                line = re.sub(r'\b(let|const|var)\s+([a-z][a-zA-Z0-9_]*)',
-                             lambda m: f"{m.group(1)} {self._to_camel_case(m.group(2))}", line)
-                # Fix function names
-                line = re.sub(r'\bfunction\s+([a-z][a-zA-Z0-9_]*)',
-                             lambda m: f"function {self._to_camel_case(m.group(1))}", line)
-                self.refactored_lines[i] = line
+            # Fix variable declarations
+            line = _JS_DECL_RE.sub(
+                lambda m: f"{m.group(1)} {self._to_camel_case(m.group(2))}", line)
+            # Fix function names
+            return _JS_FUNC_RE.sub(
+                lambda m: f"function {self._to_camel_case(m.group(1))}", line)
 
         elif self.language == 'python':
             # Convert camelCase to snake_case
-            for i, line in enumerate(self.refactored_lines):
-                # Fix function names
-                line = re.sub(r'\bdef\s+([a-z][a-zA-Z0-9_]*)',
-                             lambda m: f"def {self._to_snake_case(m.group(1))}", line)
-                # Fix class names
-                line = re.sub(r'\bclass\s+([A-Z][a-zA-Z0-9_]*)',
-                             lambda m: f"class {self._to_snake_case(m.group(1))}", line)
-                self.refactored_lines[i] = line
+            # Fix function names
+            line = _SNAKE_DEF_RE.sub(
+                lambda m: f"def {self._to_snake_case(m.group(1))}", line)
+            # Fix class names
+            return _SNAKE_CLASS_RE.sub(
+                lambda m: f"class {self._to_snake_case(m.group(1))}", line)
+
+        return line
 
     def _shorten_functions(self):
         """Attempt to break down long functions"""
+        self._break_lines_longer_than(80)
+
+    def _shorten_line(self, line: str) -> str:
+        """Break one line longer than 80 characters"""
         # This is a simplified version - in practice, you'd need more sophisticated AST parsing
-        if self.language in ['js', 'ts']:
-            self.refactored_lines = [
-                line if len(line) <= 80 else self._break_js_line(line)
-                for line in self.refactored_lines
-            ]
-        else:
-            self.refactored_lines = [
-                line if len(line) <= 80 else self._break_python_line(line)
-                for line in self.refactored_lines
-            ]
+        return line if len(line) <= 80 else self._break_line(line)
 
     def _remove_trailing_whitespace(self):
         """Remove trailing whitespace from all lines"""
-        for i, line in enumerate(self.refactored_lines):
-            self.refactored_lines[i] = line.rstrip() + '\n'
+        # One substitution over the whole text instead of a strip per line
+        text = _TRAILING_WS_RE.sub('', ''.join(self.refactored_lines))
+        if not text:
+            return
+        if not text.endswith('\n'):
+            text += '\n'
+        self.refactored_lines = [line + '\n' for line in text[:-1].split('\n')]
 
     def _break_long_lines(self):
         """Break long lines into multiple lines"""
-        for i, line in enumerate(self.refactored_lines):
-            if len(line) > 100:
-                if self.language in ['js', 'ts']:
-                    self.refactored_lines[i] = self._break_js_line(line)
-                else:
-                    self.refactored_lines[i] = self._break_python_line(line)
+        self._break_lines_longer_than(100)
+
+    def _break_long_line(self, line: str) -> str:
+        """Break one line longer than 100 characters"""
+        return line if len(line) <= 100 else self._break_line(line)
+
+    def _break_lines_longer_than(self, limit: int):
+        """Break every line longer than limit, touching only those lines"""
+        lines = self.refactored_lines
+        if max(map(len, lines), default=0) <= limit:
+            return
+        break_line = self._break_line
+        for i, line in enumerate(lines):
+            if len(line) > limit:
+                lines[i] = break_line(line)
 
     def _extract_constants(self):
         """Extract magic numbers to constants"""
-        # Find common magic numbers and replace them
-        magic_numbers = {
-            '1000': 'MAX_ITEMS',
-            '100': 'DEFAULT_TIMEOUT',
-            '50': 'MAX_RESULTS',
-            '10': 'DEFAULT_LIMIT',
-            '5': 'RETRY_COUNT'
-        }
-
-        for i, line in enumerate(self.refactored_lines):
-            for num, const_name in magic_numbers.items():
-                if num in line:
-                    # Add constant declaration at top if not exists
-                    if i > 0 and not any(const_name in l for l in self.refactored_lines[:i]):
+        lines = self.refactored_lines
+        declared: Set[str] = set()
+        declarations = []
+
+        # One substitution per line; the callback records which numbers it replaced
+        found: List[str] = []
+
+        def replace(match):
+            found.append(match.group(1))
+            return _MAGIC_MAP[match.group(1)]
+
+        for i, line in enumerate(lines):
+            line, count = _MAGIC_RE.subn(replace, line)
+            if count:
+                for num in dict.fromkeys(found):
+                    const_name = _MAGIC_MAP[num]
+                    if const_name not in declared:
                         if self.language == 'python':
-                            self.refactored_lines.insert(i, f"{const_name} = {num}\n")
+                            declarations.append(f"{const_name} = {num}\n")
                         else:
-                            self.refactored_lines.insert(i, f"const {const_name} = {num};\n")
+                            declarations.append(f"const {const_name} = {num};\n")
+                        declared.add(const_name)
+                found.clear()
+                lines[i] = line
+            declared.update(_MAGIC_CONST_RE.findall(line))
+
+        if declarations:
+            # Declare all constants at module level, once, below the file header
+            at = self._header_end(lines)
+            lines[at:at] = declarations
+
+    def _header_end(self, lines: List[str]) -> int:
+        """Index of the first line after the leading comments, docstring and imports"""
+        end = 0
+        i = 0
+        while i < len(lines):
+            stripped = lines[i].strip()
+            if not stripped:
+                i += 1
+                continue
+
+            if self.language == 'python':
+                docstring = _PY_DOCSTRING_RE.match(stripped)
+                if stripped.startswith('#'):
+                    i += 1
+                elif docstring:
+                    # Skip to the line that closes the docstring
+                    quote = docstring.group(1)
+                    rest = stripped[docstring.end():]
+                    while quote not in rest and i + 1 < len(lines):
                         i += 1
-
-                    # Replace number with constant
-                    line = line.replace(num, const_name)
-            self.refactored_lines[i] = line
+                        rest = lines[i]
+                    i += 1
+                elif lines[i].startswith(('import ', 'from ')):
+                    # Follow parenthesized and backslash-continued imports
+                    depth = 0
+                    while i < len(lines):
+                        line = lines[i].rstrip()
+                        depth += line.count('(') - line.count(')')
+                        i += 1
+                        if depth <= 0 and not line.endswith('\\'):
+                            break
+                else:
+                    break
+            else:
+                if stripped.startswith('//'):
+                    i += 1
+                elif stripped.startswith('/*'):
+                    while '*/' not in lines[i] and i + 1 < len(lines):
+                        i += 1
+                    i += 1
+                elif stripped.startswith(('import ', "'use strict'", '"use strict"')):
+                    # Multi-line imports end once their braces are closed
+                    depth = 0
+                    while i < len(lines):
+                        depth += lines[i].count('{') - lines[i].count('}')
+                        i += 1
+                        if depth <= 0:
+                            break
+                else:
+                    break
+            end = i
+        return end
 
     def _improve_error_handling(self):
         """Improve error handling patterns"""
-        if self.language in ['js', 'ts']:
+        if self.language in _JS_LANGS:
             for i, line in enumerate(self.refactored_lines):
                 # Improve empty catch blocks
                 if 'catch () {' in line:
@@ -219,77 +336,141 @@ class CleanCodeRefactorer:
         elif self.language == 'python':
             for i, line in enumerate(self.refactored_lines):
                 # Improve bare except blocks
-                if line.strip() == 'except:' and i + 1 < len(self.refactored_lines):
+                if _BARE_EXCEPT_RE.match(line) and i + 1 < len(self.refactored_lines):
                     if self.refactored_lines[i + 1].strip() == 'pass':
                         self.refactored_lines[i] = line.replace('except:', 'except Exception as e:')
                         self.refactored_lines[i + 1] = "    logger.error(f'Error: {e}')\n"
 
     def _remove_useless_comments(self):
         """Remove obviously useless comments"""
-        for i, line in enumerate(self.refactored_lines):
-            stripped = line.strip()
-            if (stripped.startswith('//') and (
-                stripped.lower().startswith('// todo') or
-                stripped.lower().startswith('// fixme') or
-                stripped.lower().startswith('// hack') or
-                stripped.lower().startswith('// this function')
-            )):
-                self.refactored_lines[i] = line.replace(stripped, '', 1)
+        self._map_lines(self._remove_useless_comment)
+
+    def _remove_useless_comment(self, line: str) -> str:
+        """Remove an obviously useless comment from one line"""
+        if _USELESS_COMMENT_RE.match(line):
+            return '\n'
+        return line
 
     def _to_camel_case(self, snake_str: str) -> str:
         """Convert snake_case to camelCase"""
-        components = snake_str.split('_')
-        return components[0] + ''.join(word.capitalize() for word in components[1:])
+        return _SNAKE_RE.sub(lambda m: m.group(1).upper(), snake_str)
 
     def _to_snake_case(self, camel_str: str) -> str:
         """Convert camelCase to snake_case"""
-        result = []
-        for i, char in enumerate(camel_str):
-            if char.isupper() and i > 0:
-                result.append('_')
-            result.append(char.lower())
-        return ''.join(result)
+        return _CAMEL_RE2.sub(r'\1_\2', _CAMEL_RE1.sub(r'\1_\2', camel_str)).lower()
 
     def _break_js_line(self, line: str) -> str:
         """Break a long JavaScript line"""
-        if '+' in line and 'template' not in line:
-            parts = line.split('+')
-            if len(parts) > 1:
-                indent = len(line) - len(line.lstrip())
-                spaces = ' ' * indent
-                return parts[0] + ' +\n' + spaces + ' + '.join(parts[1:])
-        return line
+        if 'template' in line:
+            return line
+        head, sep, tail = line.partition('+')
+        if not sep:
+            return line
+        spaces = ' ' * (len(line) - len(line.lstrip()))
+        return head + ' +\n' + spaces + tail.replace('+', ' + ')
 
     def _break_python_line(self, line: str) -> str:
         """Break a long Python line"""
-        if '(' in line and ')' in line:
-            parts = line.split('(')
-            if len(parts) > 1:
-                indent = len(line) - len(line.lstrip())
-                spaces = ' ' * indent
-                return parts[0] + '(\n' + ' ' * (indent + 4) + ', '.join(parts[1].split(',')) + '\n' + spaces + ')'
-        return line
+        head, sep, tail = line.partition('(')
+        if not sep:
+            return line
+        args, close, rest = tail.rpartition(')')
+        if not close:
+            return line
+        indent = len(line) - len(line.lstrip())
+        spaces = ' ' * indent
+        return head + '(\n' + ' ' * (indent + 4) + args.replace(',', ', ') + '\n' + spaces + ')' + rest
+
+
+# Every rule, in the order refactor() applies them; functions take the refactorer
+_ALL_RULES: Dict[str, RefactoringRule] = {
+    'fix_naming': RefactoringRule(
+        'fix_naming', 'naming',
+        'Fix naming conventions',
+        CleanCodeRefactorer._fix_naming_conventions,
+        CleanCodeRefactorer._fix_naming_line
+    ),
+    'shorten_functions': RefactoringRule(
+        'shorten_functions', 'functions',
+        'Break down long functions',
+        CleanCodeRefactorer._shorten_functions,
+        CleanCodeRefactorer._shorten_line
+    ),
+    'remove_trailing_whitespace': RefactoringRule(
+        'remove_trailing_whitespace', 'formatting',
+        'Remove trailing whitespace',
+        CleanCodeRefactorer._remove_trailing_whitespace
+    ),
+    'break_long_lines': RefactoringRule(
+        'break_long_lines', 'formatting',
+        'Break long lines',
+        CleanCodeRefactorer._break_long_lines,
+        CleanCodeRefactorer._break_long_line
+    ),
+    'extract_constants': RefactoringRule(
+        'extract_constants', 'magic_numbers',
+        'Extract magic numbers to constants',
+        CleanCodeRefactorer._extract_constants
+    ),
+    'improve_error_handling': RefactoringRule(
+        'improve_error_handling', 'error_handling',
+        'Improve error handling',
+        CleanCodeRefactorer._improve_error_handling
+    ),
+    'remove_useless_comments': RefactoringRule(
+        'remove_useless_comments', 'comments',
+        'Remove useless comments',
+        CleanCodeRefactorer._remove_useless_comments,
+        CleanCodeRefactorer._remove_useless_comment
+    )
+}
+
+
+_worker_refactorer: Optional[CleanCodeRefactorer] = None
+_worker_rules: Optional[List[str]] = None
+
+
+def _worker_init(language: str, rules: Optional[List[str]]):
+    """Create the refactorer once per worker"""
+    global _worker_refactorer, _worker_rules
+    _worker_refactorer = CleanCodeRefactorer(language)
+    _worker_rules = rules
+
+
+def _refactor_one(file_path: str) -> Dict[str, Any]:
+    """Refactor a single file with the worker's refactorer"""
+    return _worker_refactorer.refactor(file_path, _worker_rules)
 
 
 def main():
     parser = argparse.ArgumentParser(description='Refactor code according to Clean Code principles')
-    parser.add_argument('--file', required=True, help='Path to the code file to refactor')
+    parser.add_argument('--file', required=True, action='append',
+                       help='Path to a code file to refactor (repeat to refactor several files)')
     parser.add_argument('--language', required=True, choices=['js', 'ts', 'python'],
-                       help='Programming language of the file')
+                       help='Programming language of the files')
     parser.add_argument('--rules', nargs='+',
                        help='Specific rules to apply (default: apply all rules)')
     parser.add_argument('--dry-run', action='store_true',
-                       help='Show what would be changed without actually modifying the file')
+                       help='Show what would be changed without actually modifying the files')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1,
+                       help='Number of files to refactor in parallel (default: CPU count)')
 
     args = parser.parse_args()
 
-    try:
-        refactorer = CleanCodeRefactorer(args.language)
+    # A file listed twice (under any path) must not be rewritten by two workers
+    seen: Set[str] = set()
+    files: List[str] = []
+    for file_path in args.file:
+        real_path = os.path.realpath(file_path)
+        if real_path not in seen:
+            seen.add(real_path)
+            files.append(file_path)
 
+    try:
         if args.dry_run:
-            # Simulate refactoring without actually changing the file
-            print(f"🔧 Dry run mode - What would be applied to {args.file}:")
-            rules = refactorer._get_all_rules()
+            # Simulate refactoring without actually changing the files
+            print(f"🔧 Dry run mode - What would be applied to {', '.join(files)}:")
+            rules = _ALL_RULES
             if args.rules:
                 for rule_name in args.rules:
                     if rule_name in rules:
@@ -300,22 +481,39 @@ def main():
                 for rule in rules.values():
                     print(f"  ✓ {rule.description}")
         else:
-            result = refactorer.refactor(args.file, args.rules)
-
-            if result['success']:
-                print(f"✅ Refactoring completed successfully!")
-                print(f"   Rules applied: {len(result['rules_applied'])}")
-                print(f"   Changes made: {result['changes_count']} lines modified")
-
-                if result['backup_file']:
-                    print(f"   Backup saved to: {result['backup_file']}")
-
-                if result['rules_applied']:
-                    print("   Rules applied:")
-                    for rule in result['rules_applied']:
-                        print(f"     - {rule}")
+            if len(files) == 1 or args.jobs <= 1:
+                _worker_init(args.language, args.rules)
+                results = [_refactor_one(file_path) for file_path in files]
             else:
-                print(f"❌ Refactoring failed: {result['error']}")
+                # Files are independent and CPU-bound, so refactor them in parallel,
+                # never with more workers than there are files
+                with ProcessPoolExecutor(max_workers=min(args.jobs, len(files)),
+                                         initializer=_worker_init,
+                                         initargs=(args.language, args.rules)) as executor:
+                    results = list(executor.map(_refactor_one, files))
+
+            failed = False
+            for file_path, result in zip(files, results):
+                if len(files) > 1:
+                    print(f"📄 {file_path}")
+
+                if result['success']:
+                    print(f"✅ Refactoring completed successfully!")
+                    print(f"   Rules applied: {len(result['rules_applied'])}")
+                    print(f"   Changes made: {result['changes_count']} lines modified")
+
+                    if result['backup_file']:
+                        print(f"   Backup saved to: {result['backup_file']}")
+
+                    if result['rules_applied']:
+                        print("   Rules applied:")
+                        for rule in result['rules_applied']:
+                            print(f"     - {rule}")
+                else:
+                    print(f"❌ Refactoring failed: {result['error']}")
+                    failed = True
+
+            if failed:
                 sys.exit(1)
 
     except Exception as e:
@@ -324,4 +522,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
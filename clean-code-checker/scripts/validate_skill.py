@@ -15,6 +15,12 @@ try:
 except ImportError:
     yaml = None
 
+# File extensions allowed inside a skill's scripts directory
+VALID_SCRIPT_SUFFIXES = frozenset({'.py', '.js', '.ts', '.sh'})
+
+# At least one letter or digit, so names made only of separators are rejected
+_NAME_RE = re.compile(r'[\-_ ]*[A-Za-z0-9][A-Za-z0-9\-_ ]*')
+
 
 def validate_skill(skill_path: str) -> Tuple[bool, str]:
     """Validate a skill meets all requirements"""
@@ -32,18 +38,21 @@ def validate_skill(skill_path: str) -> Tuple[bool, str]:
     # Validate SKILL.md content
     try:
         with open(skill_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        # Check for YAML frontmatter
-        if not content.startswith('---'):
-            return False, "SKILL.md must start with YAML frontmatter"
-
-        # Extract frontmatter
-        frontmatter_end = content.find('---', 3)
-        if frontmatter_end == -1:
-            return False, "SKILL.md has invalid YAML frontmatter"
-
-        frontmatter = content[3:frontmatter_end]
+            # Check for YAML frontmatter
+            first_line = f.readline()
+            if not first_line.startswith('---'):
+                return False, "SKILL.md must start with YAML frontmatter"
+
+            # Extract frontmatter; the body after it is never read
+            frontmatter_lines = [first_line[3:]]
+            for line in f:
+                if line.strip() == '---':
+                    break
+                frontmatter_lines.append(line)
+            else:
+                return False, "SKILL.md has invalid YAML frontmatter"
+
+        frontmatter = ''.join(frontmatter_lines)
 
         # Parse YAML
         if yaml:
@@ -67,7 +76,7 @@ def validate_skill(skill_path: str) -> Tuple[bool, str]:
 
         # Validate content
         errors = []
-        if not metadata['name'].replace('-', '').replace('_', '').replace(' ', '').isalnum():
+        if not _NAME_RE.fullmatch(metadata['name']):
             errors.append("Skill name should contain only alphanumeric characters, hyphens, underscores, and spaces")
 
         if len(metadata['description']) < 10:
@@ -92,10 +101,13 @@ def validate_skill(skill_path: str) -> Tuple[bool, str]:
 
             # Validate file extensions in directories
             if dir_name == 'scripts':
-                script_extensions = ['.py', '.js', '.ts', '.sh']
-                for file_path in dir_path.rglob('*'):
-                    if file_path.is_file():
-                        if not any(file_path.suffix.endswith(ext) for ext in script_extensions):
+                for root, _, files in os.walk(dir_path):
+                    for name in files:
+                        if os.path.splitext(name)[1] in VALID_SCRIPT_SUFFIXES:
+                            continue
+                        # os.walk also lists broken symlinks; only real files count
+                        file_path = os.path.join(root, name)
+                        if os.path.isfile(file_path):
                             return False, f"Invalid file extension in scripts directory: {file_path}"
 
     return True, "Skill validation passed"